@@ -0,0 +1,123 @@
+# _rr_jit.py
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba not installed -> run the kernel as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# =========================
+# Frequency levels & strategies understood by the kernel
+# =========================
+
+# Defined here (not in cpu_scheduler_core) so the kernel and the Python
+# strategies share one definition; POWER_TABLE[level] is the power draw.
+FREQ_LOW, FREQ_MED, FREQ_HIGH = 0, 1, 2
+
+# energy_aware_strategy: queue length up to these -> low / med, else high
+LOW_FREQ_MAX_QUEUE = 2
+MED_FREQ_MAX_QUEUE = 5
+
+STRATEGY_ALWAYS_HIGH = 0
+STRATEGY_ENERGY_AWARE = 1
+
+
+# =========================
+# Round Robin kernel
+# =========================
+
+@njit(cache=True, nogil=True)
+def rr_kernel(arrival, burst, quantum, strategy_id):
+    """
+    Round Robin over processes already sorted by arrival time.
+    Returns (pid_idx, start, end, freq_idx) arrays, one element per
+    Gantt segment; pid_idx is -1 for idle segments.
+    """
+    n = arrival.shape[0]
+
+    # Upper bound on segments: every slice of every process + one idle gap each
+    cap = n
+    for k in range(n):
+        cap += max(1, (burst[k] + quantum - 1) // quantum)
+    seg_pid = np.empty(cap, dtype=np.int64)
+    seg_start = np.empty(cap, dtype=np.int64)
+    seg_end = np.empty(cap, dtype=np.int64)
+    seg_freq = np.empty(cap, dtype=np.int8)
+    m = 0
+
+    # Ready queue as a ring buffer; each process is queued at most once
+    ready = np.empty(max(n, 1), dtype=np.int64)
+    head = 0
+    size = 0
+
+    remaining = burst.copy()
+    time = arrival[0] if n > 0 else 0
+    i = 0
+    completed = 0
+
+    while completed < n:
+        # Add arrivals up to current time
+        while i < n and arrival[i] <= time:
+            ready[(head + size) % n] = i
+            size += 1
+            i += 1
+
+        if size == 0:
+            if i < n:
+                seg_pid[m] = -1
+                seg_start[m] = time
+                seg_end[m] = arrival[i]
+                seg_freq[m] = FREQ_LOW
+                m += 1
+                time = arrival[i]
+                continue
+            else:
+                break  # no more processes
+
+        current = ready[head]
+        head = (head + 1) % n
+        size -= 1
+
+        exec_time = min(quantum, remaining[current])
+        queue_len = size + 1
+
+        # Mirrors always_high_strategy / energy_aware_strategy
+        if strategy_id == STRATEGY_ENERGY_AWARE:
+            if queue_len <= LOW_FREQ_MAX_QUEUE:
+                freq = FREQ_LOW
+            elif queue_len <= MED_FREQ_MAX_QUEUE:
+                freq = FREQ_MED
+            else:
+                freq = FREQ_HIGH
+        else:
+            freq = FREQ_HIGH
+
+        seg_pid[m] = current
+        seg_start[m] = time
+        seg_end[m] = time + exec_time
+        seg_freq[m] = freq
+        m += 1
+        remaining[current] -= exec_time
+        time += exec_time
+
+        # Add any new arrivals that came during this time slice
+        while i < n and arrival[i] <= time:
+            ready[(head + size) % n] = i
+            size += 1
+            i += 1
+
+        if remaining[current] > 0:
+            ready[(head + size) % n] = current
+            size += 1
+        else:
+            completed += 1
+
+    return seg_pid[:m], seg_start[:m], seg_end[:m], seg_freq[:m]
+
+
+# Pre-warm so the first simulation doesn't pay the compile latency
+rr_kernel(np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.int64), 1, STRATEGY_ALWAYS_HIGH)
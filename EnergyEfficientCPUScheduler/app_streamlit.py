@@ -1,10 +1,17 @@
 # app_streamlit.py
 
+from concurrent.futures import ThreadPoolExecutor
+
+import altair as alt
 import streamlit as st
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
 
 from cpu_scheduler_core import (
     Process,
+    SimulationResult,
     simulate_fcfs,
     simulate_sjf,
     simulate_priority,
@@ -24,63 +31,152 @@ Compare performance using **waiting time, turnaround time, response time, CPU ut
 # Sidebar
 st.sidebar.header("Simulation Settings")
 
-algo = st.sidebar.selectbox(
-    "Select Algorithm (for individual run)",
-    [
-        "FCFS",
-        "SJF (Non-preemptive)",
-        "Priority (Non-preemptive)",
-        "Round Robin",
-        "Energy-Efficient RR",
-    ],
-)
+ALGORITHMS = [
+    "FCFS",
+    "SJF (Non-preemptive)",
+    "Priority (Non-preemptive)",
+    "Round Robin",
+    "Energy-Efficient RR",
+]
+
+# Only these use the time quantum; others are cached without it
+QUANTUM_ALGORITHMS = {"Round Robin", "Energy-Efficient RR"}
+
+# Inputs are batched in a form so editing them doesn't rerun the script
+with st.sidebar.form("sim"):
+    algo = st.selectbox("Select Algorithm (for individual run)", ALGORITHMS)
+
+    quantum = st.number_input("Time Quantum (used in RR / EE-RR)", min_value=1, max_value=10, value=2)
+
+    st.subheader("Process Input")
+
+    arrivals_str = st.text_input("Arrival times", "0,2,4,5")
+    bursts_str = st.text_input("Burst times", "7,4,1,4")
+    priorities_str = st.text_input("Priorities", "2,1,3,2")
+
+    run_button = st.form_submit_button("Run Selected Algorithm")
+    compare_button = st.form_submit_button("Compare All Algorithms")
+
+def parse_list(text, label):
+    # Older NumPy truncates at the first bad field instead of raising,
+    # so also check that every comma-separated field was parsed.
+    try:
+        values = np.fromstring(text, sep=",", dtype=np.int64)
+    except ValueError:
+        values = None
+    if values is None or len(values) != text.count(",") + 1:
+        raise ValueError(f"{label} must be a comma-separated list of integers, e.g. 0,2,4,5")
+    return values
+
+@st.cache_data(show_spinner=False)
+def _build_processes(arrivals_str: str, bursts_str: str, priorities_str: str) -> tuple[Process, ...]:
+    """Parse the sidebar inputs into processes; memoized on the raw strings."""
+    if not arrivals_str.strip() or not bursts_str.strip():
+        raise ValueError("No processes: enter at least one arrival time and burst time.")
+
+    # Back to plain ints so Process fields stay Python ints
+    arrivals = parse_list(arrivals_str, "Arrival times").tolist()
+    bursts = parse_list(bursts_str, "Burst times").tolist()
+    priorities = parse_list(priorities_str, "Priorities").tolist()
 
-quantum = st.sidebar.number_input("Time Quantum (used in RR / EE-RR)", min_value=1, max_value=10, value=2)
+    if len(arrivals) != len(bursts):
+        raise ValueError("Arrival and Burst count must match!")
 
-st.sidebar.subheader("Process Input")
+    if len(priorities) != len(arrivals):
+        priorities = [1] * len(arrivals)
 
-arrivals_str = st.sidebar.text_input("Arrival times", "0,2,4,5")
-bursts_str = st.sidebar.text_input("Burst times", "7,4,1,4")
-priorities_str = st.sidebar.text_input("Priorities", "2,1,3,2")
+    return tuple(
+        Process(f"P{i+1}", arrivals[i], bursts[i], priorities[i])
+        for i in range(len(arrivals))
+    )
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _run(algo, processes, quantum=None, _by_arrival=None) -> SimulationResult:
+    """
+    Run one algorithm; memoized on (algo, processes, quantum) so reruns are free.
+    _by_arrival (optional pre-sorted processes) is left out of the cache key.
+    """
+    processes = list(processes)
+    if algo == "FCFS":
+        return simulate_fcfs(processes, _by_arrival=_by_arrival)
+    elif algo == "SJF (Non-preemptive)":
+        return simulate_sjf(processes, _by_arrival=_by_arrival)
+    elif algo == "Priority (Non-preemptive)":
+        return simulate_priority(processes, _by_arrival=_by_arrival)
+    elif algo == "Round Robin":
+        return simulate_rr(processes, quantum=quantum, _by_arrival=_by_arrival)
+    elif algo == "Energy-Efficient RR":
+        return simulate_energy_efficient(processes, quantum=quantum, _by_arrival=_by_arrival)
+    raise ValueError(f"Unknown algorithm: {algo}")
+
+@st.cache_data(show_spinner=False)
+def _results_table(sig) -> pd.DataFrame:
+    """Build the comparison table from a tuple of per-algorithm metric rows."""
+    return pd.DataFrame(
+        [[round(v, 2) if isinstance(v, float) else v for v in row] for row in sig],
+        columns=[
+            "Algorithm",
+            "Avg Waiting Time",
+            "Avg Turnaround Time",
+            "Avg Response Time",
+            "CPU Utilization (%)",
+            "Total Energy",
+        ],
+    )
+
+@st.cache_resource(show_spinner=False)
+def _gantt_chart(pid_idx, starts, ends, pids_tuple) -> alt.Chart:
+    """Gantt chart from the result's segment arrays, rendered client-side by Vega-Lite."""
+    running = pid_idx >= 0
+    df = pd.DataFrame({
+        "pid": np.array(pids_tuple, dtype=object)[pid_idx[running]],
+        "start": starts[running],
+        "end": ends[running],
+    })
+    df["mid"] = (df["start"] + df["end"]) / 2
+
+    y = alt.Y("pid:N", sort=list(pids_tuple), title=None)
+    bars = alt.Chart(df).mark_bar().encode(
+        x=alt.X("start:Q", title="Time"),
+        x2="end:Q",
+        y=y,
+        color=alt.Color("pid:N", sort=list(pids_tuple), legend=None),
+        tooltip=["pid", "start", "end"],
+    )
+    labels = alt.Chart(df).mark_text(color="white").encode(x="mid:Q", y=y, text="pid:N")
+    return (bars + labels).properties(height=max(120, 40 * len(pids_tuple)))
+
+def _energy_fig(algos, energy) -> Figure:
+    """
+    Energy comparison bar chart. Built per render on a standalone Figure:
+    Matplotlib isn't thread-safe, so a figure must not be shared between sessions.
+    """
+    fig = Figure(figsize=(11, 5))
+    ax = fig.subplots()
 
-run_button = st.sidebar.button("Run Selected Algorithm")
-compare_button = st.sidebar.button("Compare All Algorithms")
+    ax.bar(algos, energy)
+    ax.set_ylabel("Energy (units)")
+    ax.set_xlabel("Algorithm")
+    ax.set_title("Energy Consumption Comparison")
 
-def parse_list(text):
-    return [int(x.strip()) for x in text.split(",")]
+    # ⭐ FIX: Rotate long labels & adjust spacing
+    plt.setp(ax.get_xticklabels(), rotation=30, ha='right')
+    fig.tight_layout()
+    return fig
 
 # Process parsing
 if run_button or compare_button:
-    arrivals = parse_list(arrivals_str)
-    bursts = parse_list(bursts_str)
-    priorities = parse_list(priorities_str)
-
-    if len(arrivals) != len(bursts):
-        st.error("Arrival and Burst count must match!")
+    try:
+        processes = _build_processes(arrivals_str, bursts_str, priorities_str)
+    except ValueError as e:
+        st.error(str(e))
         st.stop()
 
-    if len(priorities) != len(arrivals):
-        priorities = [1] * len(arrivals)
-
-    processes = [
-        Process(f"P{i+1}", arrivals[i], bursts[i], priorities[i])
-        for i in range(len(arrivals))
-    ]
-
 # --------------------------
 # INDIVIDUAL RUN
 # --------------------------
 if run_button:
-    if algo == "FCFS":
-        result = simulate_fcfs(processes)
-    elif algo == "SJF (Non-preemptive)":
-        result = simulate_sjf(processes)
-    elif algo == "Priority (Non-preemptive)":
-        result = simulate_priority(processes)
-    elif algo == "Round Robin":
-        result = simulate_rr(processes, quantum=quantum)
-    elif algo == "Energy-Efficient RR":
-        result = simulate_energy_efficient(processes, quantum=quantum)
+    result = _run(algo, processes, quantum if algo in QUANTUM_ALGORITHMS else None)
 
     st.subheader(f"🔧 Results for {result.algorithm}")
 
@@ -93,45 +189,40 @@ if run_button:
 
     st.subheader("📍 Gantt Chart")
 
-    fig, ax = plt.subplots(figsize=(10, 3))
-    pids = sorted({e.pid for e in result.gantt if e.pid})
-    pid_map = {p: i for i, p in enumerate(pids)}
-
-    for entry in result.gantt:
-        if entry.pid:
-            ax.barh(pid_map[entry.pid], entry.end - entry.start, left=entry.start)
-            ax.text((entry.start + entry.end) / 2, pid_map[entry.pid], entry.pid, ha='center', va='center')
-
-    ax.set_yticks(list(pid_map.values()))
-    ax.set_yticklabels(pids)
-    ax.set_xlabel("Time")
-    ax.grid(True)
-    st.pyplot(fig)
+    chart = _gantt_chart(result.pid_idx, result.starts, result.ends, tuple(result.pid_order))
+    st.altair_chart(chart, width="stretch")
 
 # --------------------------
 # COMPARISON MODE
 # --------------------------
 if compare_button:
-    results = [
-        simulate_fcfs(processes),
-        simulate_sjf(processes),
-        simulate_priority(processes),
-        simulate_rr(processes, quantum=quantum),
-        simulate_energy_efficient(processes, quantum=quantum),
-    ]
+    # Sort by arrival once for all five simulators
+    procs_sorted = tuple(sorted(processes, key=lambda p: p.arrival_time))
+
+    # Simulators are pure functions of their inputs, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(ALGORITHMS)) as ex:
+        futs = [
+            ex.submit(
+                _run, name, processes, quantum if name in QUANTUM_ALGORITHMS else None, procs_sorted
+            )
+            for name in ALGORITHMS
+        ]
+        results = [f.result() for f in futs]
 
     st.subheader("📊 Algorithm Performance Comparison")
 
-    data = {
-        "Algorithm": [r.algorithm for r in results],
-        "Avg Waiting Time": [round(r.avg_waiting_time, 2) for r in results],
-        "Avg Turnaround Time": [round(r.avg_turnaround_time, 2) for r in results],
-        "Avg Response Time": [round(r.avg_response_time, 2) for r in results],
-        "CPU Utilization (%)": [round(r.cpu_utilization, 2) for r in results],
-        "Total Energy": [round(r.total_energy, 2) for r in results],
-    }
-
-    st.table(data)
+    sig = tuple(
+        (
+            r.algorithm,
+            r.avg_waiting_time,
+            r.avg_turnaround_time,
+            r.avg_response_time,
+            r.cpu_utilization,
+            r.total_energy,
+        )
+        for r in results
+    )
+    st.dataframe(_results_table(sig), width="stretch")
 
     best_turn = min(results, key=lambda r: r.avg_turnaround_time)
     best_energy = min(results, key=lambda r: r.total_energy)
@@ -141,17 +232,6 @@ if compare_button:
 
     st.subheader("⚡ Energy Usage Comparison")
 
-    fig, ax = plt.subplots(figsize=(11, 5))
-    algos = [r.algorithm for r in results]
-    energy = [r.total_energy for r in results]
-
-    ax.bar(algos, energy)
-    ax.set_ylabel("Energy (units)")
-    ax.set_xlabel("Algorithm")
-    ax.set_title("Energy Consumption Comparison")
-# hello
-    # ⭐ FIX: Rotate long labels & adjust spacing
-    plt.xticks(rotation=30, ha='right')
-    fig.tight_layout()
-
-    st.pyplot(fig)
+    algos = tuple(r.algorithm for r in results)
+    energy = tuple(r.total_energy for r in results)
+    st.pyplot(_energy_fig(algos, energy))
@@ -1,35 +1,68 @@
 # cpu_scheduler_core.py
 
+import heapq
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Deque, Iterator, List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from _rr_jit import (
+    rr_kernel,
+    FREQ_LOW,
+    FREQ_MED,
+    FREQ_HIGH,
+    LOW_FREQ_MAX_QUEUE,
+    MED_FREQ_MAX_QUEUE,
+    STRATEGY_ALWAYS_HIGH,
+    STRATEGY_ENERGY_AWARE,
+)
 
 # =========================
 # Data Models
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class Process:
     pid: str
     arrival_time: int
     burst_time: int
     priority: int = 0  # lower number = higher priority
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GanttEntry:
+    """One Gantt segment; only used as a convenience view of SimulationResult."""
     pid: Optional[str]  # None for idle
     start: int
     end: int
-    freq_level: str  # 'low' / 'med' / 'high'
+    freq_level: int  # FREQ_LOW / FREQ_MED / FREQ_HIGH (index into POWER_TABLE)
 
-@dataclass
+@dataclass(eq=False)
 class SimulationResult:
     algorithm: str
-    gantt: List[GanttEntry]
+    # Gantt chart as struct-of-arrays, one element per segment
+    starts: np.ndarray    # int64
+    ends: np.ndarray      # int64
+    pid_idx: np.ndarray   # int64 index into pid_order, -1 for idle
+    freq_idx: np.ndarray  # int8 FREQ_LOW / FREQ_MED / FREQ_HIGH
     avg_waiting_time: float
     avg_turnaround_time: float
     avg_response_time: float
     cpu_utilization: float
     total_energy: float
+    pid_order: List[str]  # Gantt row order (input order)
+
+    def __iter__(self) -> Iterator[GanttEntry]:
+        """Yield the Gantt chart segment by segment as GanttEntry objects."""
+        for k, start, end, f in zip(self.pid_idx.tolist(), self.starts.tolist(),
+                                    self.ends.tolist(), self.freq_idx.tolist()):
+            yield GanttEntry(pid=self.pid_order[k] if k >= 0 else None, start=start, end=end, freq_level=f)
+
+    @property
+    def gantt(self) -> List[GanttEntry]:
+        """Gantt chart as GanttEntry objects (built on demand from the arrays)."""
+        return list(self)
 
 
 # =========================
@@ -43,123 +76,123 @@ POWER_LEVELS: Dict[str, float] = {
     'high': 30.0,  # high frequency, high power
 }
 
-def always_high_strategy(queue_len: int, time: int, algo: str) -> str:
+# Indexed by FREQ_LOW / FREQ_MED / FREQ_HIGH (same order as POWER_LEVELS)
+POWER_TABLE = np.array(list(POWER_LEVELS.values()))
+
+def always_high_strategy(queue_len: int, time: int, algo: str) -> int:
     """Baseline strategy: always run at high frequency (more energy)."""
-    return 'high'
+    return FREQ_HIGH
 
-def energy_aware_strategy(queue_len: int, time: int, algo: str) -> str:
+def energy_aware_strategy(queue_len: int, time: int, algo: str) -> int:
     """
     Simple heuristic for energy-efficient scheduling:
     - Few processes waiting -> low frequency.
     - More load -> higher frequency.
     """
-    if queue_len <= 2:
-        return 'low'
-    elif queue_len <= 5:
-        return 'med'
+    if queue_len <= LOW_FREQ_MAX_QUEUE:
+        return FREQ_LOW
+    elif queue_len <= MED_FREQ_MAX_QUEUE:
+        return FREQ_MED
     else:
-        return 'high'
+        return FREQ_HIGH
 
 
 # =========================
 # Metrics Computation
 # =========================
 
-def compute_metrics(processes: List[Process], gantt: List[GanttEntry], algo_name: str) -> SimulationResult:
+def compute_metrics(
+    processes: List[Process],
+    pid_idx: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    freq_idx: np.ndarray,
+    algo_name: str,
+) -> SimulationResult:
     """
     Compute waiting time, turnaround time, response time,
-    CPU utilization, and total energy from Gantt chart.
+    CPU utilization, and total energy from Gantt chart arrays.
+    pid_idx indexes into processes (-1 for idle segments).
     """
-    # Initialize per-process state
-    state = {
-        p.pid: {
-            'arrival': p.arrival_time,
-            'burst': p.burst_time,
-            'start': None,
-            'completion': None,
-            'response': None,
-        }
-        for p in processes
-    }
-
-    # Infer start, completion, response times from Gantt chart
-    for entry in gantt:
-        if entry.pid is None:
-            continue
-        st = state[entry.pid]
-        if st['start'] is None:
-            st['start'] = entry.start
-        # last end encountered is completion time
-        st['completion'] = entry.end
-        if st['response'] is None:
-            st['response'] = entry.start
-
     n = len(processes)
-    total_wait = total_turn = total_resp = 0.0
-
-    for p in processes:
-        st = state[p.pid]
-        completion = st['completion']
-        if completion is None:
-            # Should not happen, but just in case
-            continue
-        turnaround = completion - p.arrival_time
-        waiting = turnaround - p.burst_time
-        response = (st['response'] - p.arrival_time) if st['response'] is not None else waiting
-        total_wait += waiting
-        total_turn += turnaround
-        total_resp += response
-
-    if gantt:
-        start_time = gantt[0].start
-        end_time = gantt[-1].end
+    arrival = np.fromiter((p.arrival_time for p in processes), dtype=np.int64, count=n)
+    burst = np.fromiter((p.burst_time for p in processes), dtype=np.int64, count=n)
+
+    # Running (non-idle) segments only
+    running = pid_idx >= 0
+    r_pid = pid_idx[running]
+    r_start = starts[running]
+    durations = ends[running] - r_start
+
+    # Gantt is chronological: earliest start is the response,
+    # latest end is the completion time.
+    first = np.full(n, np.iinfo(np.int64).max)
+    last = np.full(n, np.iinfo(np.int64).min)
+    np.minimum.at(first, r_pid, r_start)
+    np.maximum.at(last, r_pid, ends[running])
+    ran = np.bincount(r_pid, minlength=n) > 0
+
+    turnaround = last[ran] - arrival[ran]
+    waiting = turnaround - burst[ran]
+    response = first[ran] - arrival[ran]
+
+    if len(starts):
+        start_time = int(starts[0])
+        end_time = int(ends[-1])
     else:
         start_time = end_time = 0
 
-    busy_time = sum(e.end - e.start for e in gantt if e.pid is not None)
+    busy_time = int(durations.sum())
     cpu_util = (busy_time / (end_time - start_time) * 100.0) if end_time > start_time else 0.0
 
     # Energy = Power * Time for each running segment
-    total_energy = 0.0
-    for e in gantt:
-        if e.pid is None:
-            continue
-        duration = e.end - e.start
-        total_energy += POWER_LEVELS[e.freq_level] * duration
+    total_energy = float(POWER_TABLE[freq_idx[running]] @ durations)
 
     return SimulationResult(
         algorithm=algo_name,
-        gantt=gantt,
-        avg_waiting_time=total_wait / n if n else 0.0,
-        avg_turnaround_time=total_turn / n if n else 0.0,
-        avg_response_time=total_resp / n if n else 0.0,
+        starts=starts,
+        ends=ends,
+        pid_idx=pid_idx,
+        freq_idx=freq_idx,
+        avg_waiting_time=float(waiting.sum()) / n if n else 0.0,
+        avg_turnaround_time=float(turnaround.sum()) / n if n else 0.0,
+        avg_response_time=float(response.sum()) / n if n else 0.0,
         cpu_utilization=cpu_util,
         total_energy=total_energy,
+        pid_order=[p.pid for p in processes],
     )
 
 
+def _segments_to_arrays(segments: List[Tuple[int, int, int, int]]) -> Tuple[np.ndarray, ...]:
+    """(pid_idx, start, end, freq) tuples -> contiguous pid_idx/starts/ends/freq_idx arrays."""
+    pid_idx, starts, ends, freq_idx = np.array(segments, dtype=np.int64).reshape(-1, 4).T.copy()
+    return pid_idx, starts, ends, freq_idx.astype(np.int8)
+
+
 # =========================
 # FCFS
 # =========================
 
-def simulate_fcfs(processes: List[Process], freq_strategy=always_high_strategy) -> SimulationResult:
-    procs = sorted(processes, key=lambda p: p.arrival_time)
+def simulate_fcfs(processes: List[Process], freq_strategy=always_high_strategy, _by_arrival: Optional[Sequence[Process]] = None) -> SimulationResult:
+    procs = _by_arrival if _by_arrival is not None else sorted(processes, key=lambda p: p.arrival_time)
+    arrivals = [p.arrival_time for p in procs]
     time = procs[0].arrival_time if procs else 0
-    gantt: List[GanttEntry] = []
+    pid_index = {p.pid: k for k, p in enumerate(processes)}
+    segments: List[Tuple[int, int, int, int]] = []  # (pid_idx, start, end, freq)
     ready: List[Process] = []
     i = 0
     algo_name = "FCFS"
 
     while i < len(procs) or ready:
         # Add arrived processes to ready queue
-        while i < len(procs) and procs[i].arrival_time <= time:
-            ready.append(procs[i])
-            i += 1
+        j = bisect_right(arrivals, time)
+        ready.extend(procs[i:j])
+        i = j
 
         if not ready:
             # CPU idle till next arrival
             next_arrival = procs[i].arrival_time
-            gantt.append(GanttEntry(pid=None, start=time, end=next_arrival, freq_level='low'))
+            segments.append((-1, time, next_arrival, FREQ_LOW))
             time = next_arrival
             continue
 
@@ -168,83 +201,87 @@ def simulate_fcfs(processes: List[Process], freq_strategy=always_high_strategy)
         end = start + current.burst_time
         queue_len = len(ready) + 1  # including current
         freq = freq_strategy(queue_len, time, algo_name)
-        gantt.append(GanttEntry(pid=current.pid, start=start, end=end, freq_level=freq))
+        segments.append((pid_index[current.pid], start, end, freq))
         time = end
 
-    return compute_metrics(processes, gantt, algo_name)
+    return compute_metrics(processes, *_segments_to_arrays(segments), algo_name)
 
 
 # =========================
 # SJF (Non-preemptive)
 # =========================
 
-def simulate_sjf(processes: List[Process], freq_strategy=always_high_strategy) -> SimulationResult:
-    procs = sorted(processes, key=lambda p: p.arrival_time)
+def simulate_sjf(processes: List[Process], freq_strategy=always_high_strategy, _by_arrival: Optional[Sequence[Process]] = None) -> SimulationResult:
+    procs = _by_arrival if _by_arrival is not None else sorted(processes, key=lambda p: p.arrival_time)
+    arrivals = [p.arrival_time for p in procs]
     time = procs[0].arrival_time if procs else 0
-    gantt: List[GanttEntry] = []
-    ready: List[Process] = []
+    pid_index = {p.pid: k for k, p in enumerate(processes)}
+    segments: List[Tuple[int, int, int, int]] = []  # (pid_idx, start, end, freq)
+    ready: List[Tuple[int, int, int, Process]] = []  # min-heap
     i = 0
     algo_name = "SJF (Non-preemptive)"
 
     while i < len(procs) or ready:
-        while i < len(procs) and procs[i].arrival_time <= time:
-            ready.append(procs[i])
-            i += 1
+        j = bisect_right(arrivals, time)
+        for k in range(i, j):
+            heapq.heappush(ready, (procs[k].burst_time, procs[k].arrival_time, k, procs[k]))
+        i = j
 
         if not ready:
             next_arrival = procs[i].arrival_time
-            gantt.append(GanttEntry(pid=None, start=time, end=next_arrival, freq_level='low'))
+            segments.append((-1, time, next_arrival, FREQ_LOW))
             time = next_arrival
             continue
 
-        # Choose shortest burst time
-        ready.sort(key=lambda p: p.burst_time)
-        current = ready.pop(0)
+        # Choose shortest burst time (ties: earlier arrival, then input order)
+        current = heapq.heappop(ready)[-1]
         start = max(time, current.arrival_time)
         end = start + current.burst_time
         queue_len = len(ready) + 1
         freq = freq_strategy(queue_len, time, algo_name)
-        gantt.append(GanttEntry(pid=current.pid, start=start, end=end, freq_level=freq))
+        segments.append((pid_index[current.pid], start, end, freq))
         time = end
 
-    return compute_metrics(processes, gantt, algo_name)
+    return compute_metrics(processes, *_segments_to_arrays(segments), algo_name)
 
 
 # =========================
 # Priority (Non-preemptive)
 # =========================
 
-def simulate_priority(processes: List[Process], freq_strategy=always_high_strategy) -> SimulationResult:
+def simulate_priority(processes: List[Process], freq_strategy=always_high_strategy, _by_arrival: Optional[Sequence[Process]] = None) -> SimulationResult:
     # Lower priority value = higher priority
-    procs = sorted(processes, key=lambda p: p.arrival_time)
+    procs = _by_arrival if _by_arrival is not None else sorted(processes, key=lambda p: p.arrival_time)
+    arrivals = [p.arrival_time for p in procs]
     time = procs[0].arrival_time if procs else 0
-    gantt: List[GanttEntry] = []
-    ready: List[Process] = []
+    pid_index = {p.pid: k for k, p in enumerate(processes)}
+    segments: List[Tuple[int, int, int, int]] = []  # (pid_idx, start, end, freq)
+    ready: List[Tuple[int, int, int, Process]] = []  # min-heap
     i = 0
     algo_name = "Priority (Non-preemptive)"
 
     while i < len(procs) or ready:
-        while i < len(procs) and procs[i].arrival_time <= time:
-            ready.append(procs[i])
-            i += 1
+        j = bisect_right(arrivals, time)
+        for k in range(i, j):
+            heapq.heappush(ready, (procs[k].priority, procs[k].arrival_time, k, procs[k]))
+        i = j
 
         if not ready:
             next_arrival = procs[i].arrival_time
-            gantt.append(GanttEntry(pid=None, start=time, end=next_arrival, freq_level='low'))
+            segments.append((-1, time, next_arrival, FREQ_LOW))
             time = next_arrival
             continue
 
         # Choose highest priority (smallest priority number)
-        ready.sort(key=lambda p: p.priority)
-        current = ready.pop(0)
+        current = heapq.heappop(ready)[-1]
         start = max(time, current.arrival_time)
         end = start + current.burst_time
         queue_len = len(ready) + 1
         freq = freq_strategy(queue_len, time, algo_name)
-        gantt.append(GanttEntry(pid=current.pid, start=start, end=end, freq_level=freq))
+        segments.append((pid_index[current.pid], start, end, freq))
         time = end
 
-    return compute_metrics(processes, gantt, algo_name)
+    return compute_metrics(processes, *_segments_to_arrays(segments), algo_name)
 
 
 # =========================
@@ -255,60 +292,116 @@ def simulate_rr(
     processes: List[Process],
     quantum: int = 2,
     freq_strategy=always_high_strategy,
-    algo_name: str = "Round Robin"
+    algo_name: str = "Round Robin",
+    _by_arrival: Optional[Sequence[Process]] = None,
+) -> SimulationResult:
+    """
+    Built-in frequency strategies run through the compiled rr_kernel;
+    any other freq_strategy callable uses the pure-Python loop.
+    _by_arrival may pass processes already sorted by arrival time to skip
+    the sort; results are identical (pid order still follows processes).
+    """
+    strategy_id = _KERNEL_STRATEGIES.get(freq_strategy)
+    if strategy_id is None:
+        return _simulate_rr_py(processes, quantum, freq_strategy, algo_name, _by_arrival)
+
+    procs_by_arrival = _by_arrival if _by_arrival is not None else sorted(processes, key=lambda p: p.arrival_time)
+    n = len(procs_by_arrival)
+    arrival = np.fromiter((p.arrival_time for p in procs_by_arrival), dtype=np.int64, count=n)
+    burst = np.fromiter((p.burst_time for p in procs_by_arrival), dtype=np.int64, count=n)
+
+    pid_idx, starts, ends, freq_idx = rr_kernel(arrival, burst, int(quantum), strategy_id)
+
+    # Kernel indices refer to arrival order; map them back to positions in processes
+    pid_index = {p.pid: k for k, p in enumerate(processes)}
+    to_input = np.fromiter((pid_index[p.pid] for p in procs_by_arrival), dtype=np.int64, count=n)
+    pid_idx = np.where(pid_idx >= 0, to_input[pid_idx], -1)
+
+    return compute_metrics(processes, *_coalesce_segments(pid_idx, starts, ends, freq_idx), algo_name)
+
+
+def _simulate_rr_py(
+    processes: List[Process],
+    quantum: int,
+    freq_strategy,
+    algo_name: str,
+    _by_arrival: Optional[Sequence[Process]] = None,
 ) -> SimulationResult:
     remaining = {p.pid: p.burst_time for p in processes}
-    procs_by_arrival = sorted(processes, key=lambda p: p.arrival_time)
-    gantt: List[GanttEntry] = []
+    procs_by_arrival = _by_arrival if _by_arrival is not None else sorted(processes, key=lambda p: p.arrival_time)
+    arrivals = [p.arrival_time for p in procs_by_arrival]
+    pid_index = {p.pid: k for k, p in enumerate(processes)}
+    segments: List[Tuple[int, int, int, int]] = []  # (pid_idx, start, end, freq)
     time = procs_by_arrival[0].arrival_time if procs_by_arrival else 0
-    ready: List[Process] = []
+    ready: Deque[Process] = deque()
     i = 0
     completed = set()
     n_total = len(processes)
 
     while len(completed) < n_total:
         # Add arrivals up to current time
-        while i < len(procs_by_arrival) and procs_by_arrival[i].arrival_time <= time:
-            ready.append(procs_by_arrival[i])
-            i += 1
+        j = bisect_right(arrivals, time)
+        ready.extend(procs_by_arrival[i:j])
+        i = j
 
         if not ready:
             if i < len(procs_by_arrival):
                 next_arrival = procs_by_arrival[i].arrival_time
-                gantt.append(GanttEntry(pid=None, start=time, end=next_arrival, freq_level='low'))
+                segments.append((-1, time, next_arrival, FREQ_LOW))
                 time = next_arrival
                 continue
             else:
                 break  # no more processes
-        current = ready.pop(0)
+        current = ready.popleft()
         pid = current.pid
         exec_time = min(quantum, remaining[pid])
         queue_len = len(ready) + 1
         freq = freq_strategy(queue_len, time, algo_name)
         start = time
         end = time + exec_time
-        gantt.append(GanttEntry(pid=pid, start=start, end=end, freq_level=freq))
+        segments.append((pid_index[pid], start, end, freq))
         remaining[pid] -= exec_time
         time = end
 
         # Add any new arrivals that came during this time slice
-        while i < len(procs_by_arrival) and procs_by_arrival[i].arrival_time <= time:
-            ready.append(procs_by_arrival[i])
-            i += 1
+        j = bisect_right(arrivals, time)
+        ready.extend(procs_by_arrival[i:j])
+        i = j
 
         if remaining[pid] > 0:
             ready.append(current)
         else:
             completed.add(pid)
 
-    return compute_metrics(processes, gantt, algo_name)
+    return compute_metrics(processes, *_coalesce_segments(*_segments_to_arrays(segments)), algo_name)
+
+
+def _coalesce_segments(
+    pid_idx: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    freq_idx: np.ndarray,
+) -> Tuple[np.ndarray, ...]:
+    """Merge back-to-back segments of the same pid at the same frequency."""
+    if len(starts) < 2:
+        return pid_idx, starts, ends, freq_idx
+    joins = (pid_idx[1:] == pid_idx[:-1]) & (freq_idx[1:] == freq_idx[:-1]) & (starts[1:] == ends[:-1])
+    head = np.concatenate(([True], ~joins))  # first segment of each merged run
+    tail = np.concatenate((~joins, [True]))  # last segment of each merged run
+    return pid_idx[head], starts[head], ends[tail], freq_idx[head]
+
+
+_KERNEL_STRATEGIES = {
+    always_high_strategy: STRATEGY_ALWAYS_HIGH,
+    energy_aware_strategy: STRATEGY_ENERGY_AWARE,
+}
 
 
 # =========================
 # Energy-Efficient Algorithm (RR + dynamic frequency)
 # =========================
 
-def simulate_energy_efficient(processes: List[Process], quantum: int = 2) -> SimulationResult:
+def simulate_energy_efficient(processes: List[Process], quantum: int = 2, _by_arrival: Optional[Sequence[Process]] = None) -> SimulationResult:
     """
     Proposed algorithm: Round Robin for fairness,
     but frequency selected by energy_aware_strategy (queue-based).
@@ -317,7 +410,8 @@ def simulate_energy_efficient(processes: List[Process], quantum: int = 2) -> Sim
         processes,
         quantum=quantum,
         freq_strategy=energy_aware_strategy,
-        algo_name="Energy-Efficient RR"
+        algo_name="Energy-Efficient RR",
+        _by_arrival=_by_arrival,
     )
 
 